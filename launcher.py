@@ -6,7 +6,7 @@ sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
 try:
     # Import using the full package name so relative imports work
-    from src.main import login_menu, main_menu
+    from src.main import login_menu, main_menu, db
 except ImportError as e:
     print("CRITICAL ERROR: Could not import project modules.")
     print(f"Details: {e}")
@@ -19,8 +19,10 @@ if __name__ == "__main__":
         if current_user:
             main_menu(current_user)
     except KeyboardInterrupt:
+        db.flush_if_dirty() # write any changes that are still waiting to be saved
         print("\nGoodbye!")
         sys.exit()
     except Exception as e:
+        db.flush_if_dirty()
         print(f"\nFATAL ERROR: {e}")
         input("Press Enter to close...")
\ No newline at end of file
@@ -1,19 +1,33 @@
 import time
 from datetime import datetime
-from .models import StudySession, Task, Type
+from operator import attrgetter
+from .models import StudySession, Task, Type, Status
+
+NS_PER_MINUTE = 60_000_000_000 # nanoseconds in one minute
 
 class SessionController:
     """
     Handles the logic for the timing and management of study sessions.
     Connects the user interface (main.py) to the data (models.py).
     """
-    def __init__(self):
+    def __init__(self, clock = time.monotonic_ns, wall_clock = time.time):
+        # Clocks are passed in so tests can use fake ones instead of waiting for real time to pass
+        # clock: monotonic nanoseconds, used to measure durations
+        # wall_clock: seconds since the epoch, only used to record when a session started
+        self._clock = clock
+        self._wall_clock = wall_clock
+
         # The actual session object we are building
         self.active_session = None
 
         # The exact time (in seconds) when "Start" was pressed
+        # This is wall-clock time, only used to record/display when the session started
         self.start_timestamp = None
 
+        # Monotonic clock reading (in nanoseconds) when "Start" was pressed
+        # Used to measure the duration, since it can't jump if the system clock changes
+        self.start_monotonic_ns = None
+
         # The task currently being worked on (if any)
         self.current_task = None
 
@@ -25,7 +39,8 @@ class SessionController:
         """
 
         # Capture the current timestamp ("Start" click)
-        self.start_timestamp = time.time()
+        self.start_timestamp = self._wall_clock()
+        self.start_monotonic_ns = self._clock()
         self.current_task = task
 
         # Create the temporary session object
@@ -51,14 +66,11 @@ class SessionController:
         if not self.active_session:
             return None
         
-        # Capture the end time
-        end_timestamp = time.time()
-
-        # Calculate the difference in seconds
-        duration_seconds = end_timestamp - self.start_timestamp
+        # Calculate the elapsed time in nanoseconds
+        duration_ns = self._clock() - self.start_monotonic_ns
 
-        # Convert to minutes (and force to int)
-        self.active_session.duration_minutes = int(duration_seconds / 60)
+        # Convert to whole minutes using integer division (no float maths needed)
+        self.active_session.duration_minutes = duration_ns // NS_PER_MINUTE
 
         # Update the task
         # If working on a specific task, add this time to it's total history.
@@ -82,92 +94,53 @@ class AnalyticsEngine:
         2. 50 points for every completed task.
         """
         
-        score = 0.0
+        # Let the built-in sum() do the adding up, and count DONE tasks without building a throwaway list
+        total_minutes = sum(map(attrgetter("total_work_time"), day.tasks))
+        completed = sum(t.task_status == Status.DONE for t in day.tasks)
 
-        # Loop through every task recorded for this day
-        for task in day.tasks:
-            # 1. Time Bonus (Minutes / 60 * 10 points)
-            hours_studied = task.total_work_time / 60.0
-            score += (hours_studied * 10.0)
+        return AnalyticsEngine.score_from_totals(total_minutes, completed)
 
-            # 2. Completion Bonus
-            # Check if the task is finished
-            if task.task_status == 3:  # Status 3 = DONE
-                score += 50.0
+    @staticmethod
+    def score_from_totals(total_minutes, completed_tasks):
+        """
+        Turns already added-up totals into a productivity score (same algorithm as calculate_daily_score).
+        Lets callers that are already looping over the tasks get the score without a second pass.
+        """
+        # 1. Time Bonus (Minutes / 60 * 10 points, which is the same as Minutes / 6)
+        # 2. Completion Bonus (50 points per DONE task)
+        score = total_minutes / 6.0 + completed_tasks * 50.0
 
         return round(score, 1) # Round to 1 decimal place
     
     @staticmethod
     def calculate_course_grade(course):
         """Calculates weighted average for a course."""
-        total_weight = sum(t.weighted_percent for t in course.tasks)
+        total_weight = 0.0
+        weighted_sum = 0.0
+
+        # Add up both totals in one pass over the tasks
+        for t in course.tasks:
+            weight = t.weighted_percent
+            total_weight += weight
+            if t.points_earned > 0:
+                weighted_sum += (t.points_earned / 100.0) * weight
+
         if total_weight == 0:
             return 0.0
         
-        weighted_sum = sum(
-            (t.points_earned / 100.0) * t.weighted_percent 
-            for t in course.tasks 
-            if t.points_earned > 0
-        )
         return round((weighted_sum / total_weight) * 100, 2)
     
-    # --- MERGE SORT HELPERS ---
-    
     @staticmethod
-    def _merge_sort_tasks(tasks, score_func):
-        """
-        Custom implementation of Merge Sort (Divide & Conquer).
-        Sorts tasks in DESCENDING order (Highest score first).
-        """
-        if len(tasks) <= 1:
-            return tasks
-
-        # DIVIDE step
-        mid = len(tasks) // 2
-        left_half = tasks[:mid]
-        right_half = tasks[mid:]
-
-        # RECURSIVE calls to sort the halves
-        sorted_left = AnalyticsEngine._merge_sort_tasks(left_half, score_func)
-        sorted_right = AnalyticsEngine._merge_sort_tasks(right_half, score_func)
-
-        # MERGE step
-        return AnalyticsEngine._merge(sorted_left, sorted_right, score_func)
-
-    @staticmethod
-    def _merge(left, right, score_func):
-        """
-        Helper method to merge two sorted lists.
-        """
-        sorted_list = []
-        i = j = 0
-
-        # Compare and merge
-        while i < len(left) and j < len(right):
-            # We want DESCENDING order, so we check if Left >= Right
-            if score_func(left[i]) >= score_func(right[j]):
-                sorted_list.append(left[i])
-                i += 1
-            else:
-                sorted_list.append(right[j])
-                j += 1
-
-        # Add remaining elements (if any)
-        sorted_list.extend(left[i:])
-        sorted_list.extend(right[j:])
-        
-        return sorted_list
-
-    @staticmethod
-    def get_smart_recommendation(student):
+    def get_smart_recommendation(student, today = None):
         """
         Calculates the most critical task to work on right now.
+        Uses 'today' as the current time if given, otherwise datetime.now().
 
         The algorithm:
         1. Filters out tasks that are already completed.
         2. Calculates a priority score based on weight vs days remaining.
-        3. Sorts using a custom Merge Sort implementation (Divide & Conquer).
-        4. Returns the highest scoring task.
+        3. Picks the highest scoring task in a single pass (no full sort needed).
+        4. Returns that task.
         """
         
         # 1. Filter out completed tasks
@@ -177,21 +150,32 @@ class AnalyticsEngine:
         if not active_tasks:
             return None, "No active tasks found! You are free."
 
-        today = datetime.now()
+        if today is None:
+            today = datetime.now()
+
+        def parse_due_date(task):
+            # Dates loaded from the database are already datetimes
+            if isinstance(task.due_date, datetime):
+                return task.due_date
 
-        def urgency_heuristic(task):
             # Data Cleaning: Handle missing or "TBD" dates
             if not task.due_date or str(task.due_date).upper() == "TBD":
-                return -1
+                return None
 
             # Parse the date logic
             try:
-                if isinstance(task.due_date, str):
-                    due = datetime.strptime(task.due_date, "%Y-%m-%d")
-                else:
-                    due = task.due_date
-            except ValueError:
-                return -1 
+                # fromisoformat is much faster than strptime for ISO dates like "2025-12-15"
+                return datetime.fromisoformat(task.due_date)
+            except (TypeError, ValueError):
+                return None
+
+        # Parse every due date exactly once, so no string work happens while scoring
+        # These lists line up with active_tasks (index i belongs to active_tasks[i])
+        parsed = [parse_due_date(t) for t in active_tasks]
+
+        def urgency_heuristic(task, due):
+            if due is None:
+                return -1
 
             # Calculate days remaining
             delta = (due - today).days
@@ -203,19 +187,16 @@ class AnalyticsEngine:
             # 2. Calculate Score (Weight / Time)
             return task.weighted_percent / days_left
 
-        # 3. Sort tasks using our custom Merge Sort
-        # Replaced the built-in .sort() with our own algorithm for the Bonus
-        sorted_tasks = AnalyticsEngine._merge_sort_tasks(active_tasks, urgency_heuristic)
-
-        # Select the winner
-        top_task = sorted_tasks[0]
-        score = urgency_heuristic(top_task)
+        # 3. Score every task exactly once into a plain list of floats, then take the "argmax"
+        # max() and .index() on a list of floats both run in C with no key function
+        # .index() returns the first of any ties, so ties keep the order the tasks were added in
+        scores = [urgency_heuristic(t, due) for t, due in zip(active_tasks, parsed)]
+        score = max(scores)
+        idx = scores.index(score)
+        top_task = active_tasks[idx]
         
-        # Calculate days for display (safely)
-        try:
-             due_dt = datetime.strptime(top_task.due_date, '%Y-%m-%d')
-             days_remaining = (due_dt - today).days
-        except:
-             days_remaining = "?"
+        # Calculate days for display (reusing the already parsed date)
+        due_dt = parsed[idx]
+        days_remaining = (due_dt - today).days if due_dt is not None else "?"
 
         return top_task, f"Priority Score: {score:.1f} (Weight: {top_task.weighted_percent}% / Days Left: {days_remaining})"
\ No newline at end of file
@@ -1,42 +1,102 @@
 import os
 import sys
 import re
+import math
 from datetime import datetime
 import time
 
-from .models import Student, Course, Task, Type, Day, Status
+from .models import Student, Course, Task, Type, Status, dummy_password_check
 from .storage import DatabaseHandler
 from .controllers import SessionController, AnalyticsEngine
 
 # initialize the DatabaseHandler globally so all modules can access it
 db = DatabaseHandler()
 
-def clear_screen():
-    """Clears the terminal screen for a cleaner UI."""
-    os.system('cls' if os.name == 'nt' else 'clear')
+# Windows consoles only understand ANSI escape codes once VT processing is switched on.
+# Running an empty command once at startup is the simplest way to turn it on.
+if os.name == 'nt':
+    os.system('')
+
+# ANSI escape codes for "clear the screen" + "move the cursor to the top left"
+# Writing these directly is much faster than starting a 'cls'/'clear' process every time a menu is drawn
+_CLEAR = "\x1b[2J\x1b[H"
 
 def print_header(title):
-    """Prints a perfectly centered header for the current menu."""
-    clear_screen()
+    """Clears the screen, then prints a perfectly centered header for the current menu."""
     width = len(title) + 4
-    print("=" * width)
-    print(title.center(width))
-    print("=" * width)
-    print()
+    border = "=" * width
+
+    # clear the screen and draw the whole header with a single write
+    sys.stdout.write(f"{_CLEAR}{border}\n{title.center(width)}\n{border}\n\n")
+
+# Short pauses that give the user time to read a message before the screen is cleared.
+# Set the SPAP_UX_DELAY environment variable (in seconds, e.g. SPAP_UX_DELAY=0) to override all of them,
+# which is handy for power users and for automated/scripted runs.
+def _read_ux_delay():
+    """Reads SPAP_UX_DELAY. Returns None (keep the normal pauses) if it isn't set or isn't a usable number."""
+    try:
+        delay = float(os.environ["SPAP_UX_DELAY"])
+    except (KeyError, ValueError):
+        return None
+    return delay if math.isfinite(delay) else None # 'inf' would make time.sleep fail
+
+_UX_DELAY = _read_ux_delay()
+
+def ux_delay(seconds):
+    """Waits 'seconds' so a message can be read (or SPAP_UX_DELAY seconds instead, if it is set)."""
+    delay = seconds if _UX_DELAY is None else _UX_DELAY
+    if delay > 0:
+        time.sleep(delay)
+
+def wait_for_enter(prompt):
+    """
+    Shows a prompt and waits for the user to press Enter (whatever they typed is ignored).
+    Reads stdin directly instead of using input(), which skips the line-editing machinery
+    and returns as soon as Enter is pressed (keeps the study timer's start/stop times sharp).
+    """
+    sys.stdout.write(prompt)
+    sys.stdout.flush()
+    sys.stdin.readline()
 
 def pause():
     """Waits for the user to press Enter before continuing."""
-    input("\nPress Enter to continue...")
+    wait_for_enter("\nPress Enter to continue...")
+
+# Patterns are compiled once here instead of every time an input is checked
+STUDENT_ID_RE = re.compile(r'\A[0-9]{6}\Z') # exactly 6 digits
+DATE_RE = re.compile(r'\A[0-9]{4}-[0-9]{2}-[0-9]{2}\Z') # YYYY-MM-DD shape (the real date check is done by strptime)
+EMAIL_RE = re.compile(r'\A[^@\s]+@[^@\s]+\.[^@\s]+\Z') # something@something.something, no spaces
+NUMBER_RE = re.compile(r'\A[+-]?(?:[0-9]+(?:\.[0-9]*)?|\.[0-9]+)\Z') # plain decimal number, e.g. 20, 12.5, .5
+
+# Status labels indexed by the status number (index 0 is never a real status)
+_STATUS_LABELS = ("UNKNOWN", "TODO", "IN PROGRESS", "DONE")
 
 def get_status_label(status_int):
     """Converts status integer to text string."""
-    if status_int == 1:
-        return "TODO"
-    if status_int == 2:
-        return "IN PROGRESS"
-    if status_int == 3:
-        return "DONE"
-    return "UNKNOWN"
+    return _STATUS_LABELS[status_int] if 0 <= status_int < len(_STATUS_LABELS) else "UNKNOWN"
+
+def render_task_table(tasks, cols="status"):
+    """
+    Builds a table of tasks as one string, so it can be written to the terminal in a single call.
+    cols="status" shows ID / Status / Title, cols="due" shows ID / Title / Due Date.
+    """
+    if cols == "due":
+        lines = [f"{'ID':<5} {'Title':<30} {'Due Date'}", "─" * 60]
+        lines.extend(f"{t.task_id:<5} {t.title:<30} {format_date(t.due_date)}" for t in tasks)
+    else:
+        lines = [f"{'ID':<5} {'Status':<15} {'Title'}", "─" * 60]
+        lines.extend(f"{t.task_id:<5} {get_status_label(t.task_status):<15} {t.title}" for t in tasks)
+    return "\n".join(lines)
+
+def format_date(value):
+    """Shows a task date as YYYY-MM-DD (dates are kept as datetimes, "TBD" is shown as it is)."""
+    return value.strftime("%Y-%m-%d") if isinstance(value, datetime) else str(value)
+
+def parse_date_input(date_string):
+    """Turns a date that already passed validate_date into a datetime (blank or "TBD" stays "TBD")."""
+    if not date_string or date_string.upper() == "TBD":
+        return "TBD"
+    return datetime.fromisoformat(date_string)
 
 def confirm_action(message):
     """
@@ -54,6 +114,10 @@ def validate_date(date_string):
     if not date_string or date_string.upper() == "TBD":
         return True, None
     
+    # quick shape check first, so obviously wrong input never reaches the slower strptime
+    if not DATE_RE.match(date_string):
+        return False, "Invalid date format. Please use YYYY-MM-DD (e.g., 2025-12-15)"
+
     try:
         datetime.strptime(date_string, "%Y-%m-%d")
         return True, None
@@ -65,15 +129,15 @@ def validate_percentage(value_string):
     Validates if a string is a valid percentage (0-100).
     Returns (is_valid, float_value, error_message)
     """
-    try:
-        value = float(value_string)
-        if 0 <= value <= 100:
-            return True, value, None
-        else:
-            return False, 0.0, "Percentage must be between 0 and 100"
-    except ValueError:
+    # check the shape with a regex first, so bad input doesn't need an exception to be caught
+    if not NUMBER_RE.match(value_string):
         return False, 0.0, "Please enter a valid number"
 
+    value = float(value_string)
+    if 0 <= value <= 100:
+        return True, value, None
+    return False, 0.0, "Percentage must be between 0 and 100"
+
 def login_menu():
     """
     Handles user login and registration.
@@ -97,6 +161,12 @@ def login_menu():
                 print("\nError: Email cannot be empty. Please try again.")
                 pause()
                 continue
+
+            # a badly formatted email can't belong to any account, so skip the lookup (and the password prompt)
+            if not EMAIL_RE.match(email):
+                print("\nError: Please enter a valid email address (e.g., name@dal.ca).")
+                pause()
+                continue
             
             password = input("Enter your password: ").strip()
             
@@ -107,14 +177,17 @@ def login_menu():
 
             student = db.get_student(email)
 
-            if student and student.check_password(password):
+            # unknown emails still pay for a bcrypt check, so response time doesn't reveal which accounts exist
+            if student is None:
+                dummy_password_check(password)
+            elif student.check_password(password):
                 print(f"\n✓ Login successful! Welcome back, {email}.")
-                time.sleep(1) # brief pause for user experience
+                ux_delay(1) # brief pause for user experience
                 return student
-            else:
-                print("\n✗ Error: Invalid email or password.")
-                print("Please check your credentials and try again.")
-                pause()
+
+            print("\n✗ Error: Invalid email or password.")
+            print("Please check your credentials and try again.")
+            pause()
 
         elif choice == '2':
             # registration logic
@@ -128,6 +201,11 @@ def login_menu():
                 if not new_email:
                     print("✗ Error: Email cannot be empty. Please try again.")
                     continue  # ✅ Asks for email again, stays in registration
+
+                # same format check as login, so every new account can actually log in
+                if not EMAIL_RE.match(new_email):
+                    print("✗ Error: Please enter a valid email address (e.g., name@dal.ca).")
+                    continue  # asks for email again
                 
                 # check if user already exists
                 if db.get_student(new_email):
@@ -153,8 +231,7 @@ def login_menu():
                 new_student_id = input("Enter your 6-digit student ID: ").strip()
 
                 # check if student ID follows pattern
-                pattern = r'[0-9]{6}' # exactly 6 digits
-                if not re.fullmatch(pattern, new_student_id):
+                if not STUDENT_ID_RE.match(new_student_id):
                     print("✗ Error: Student ID must be exactly 6 digits (e.g., 123456).")
                     continue  # Ask for student ID again
                 
@@ -168,16 +245,17 @@ def login_menu():
             db.add_student(new_student)
 
             print("\n✓ Account created successfully! Logging you in...")
-            time.sleep(1)
+            ux_delay(1)
             return new_student
         
         elif choice == '3':
+            db.close() # write anything still pending before exiting
             print("Thank you for using the SPAP. Goodbye!")
             sys.exit() # kils the program immediately
 
         else:
             print("✗ Invalid choice. Please enter 1, 2, or 3.")
-            time.sleep(1)
+            ux_delay(1)
 
 def validate_password(password):
     """Checks if password meets minimum security requirements."""
@@ -187,6 +265,20 @@ def validate_password(password):
         return False, "✗ Error: Password must contain at least one number"
     return True, "Valid"
 
+# The menu options never change, so they are built once instead of on every redraw
+_MAIN_MENU_OPTIONS = (
+    "1. Start Study Session\n"
+    "2. Add New Task\n"
+    "3. Update Task Status\n"
+    "4. Edit Task Details\n"
+    "5. Delete Task\n"
+    "6. View Analytics Report\n"
+    "7. Add New Course\n"
+    "8. Smart Study Recommendation\n"
+    "9. Save & Logout\n"
+    "\nTip: Choose option 6 to see your productivity score!\n"
+)
+
 def main_menu(student):
     """
     The main application loop.
@@ -198,28 +290,22 @@ def main_menu(student):
 
     while True:
         print_header(f"Dashboard - {student.email}")
-        print(f"📊 Stats: {len(student.courses)} Courses | {len(student.tasks)} Tasks | {len(student.study_sessions)} Sessions")
-        print("-" * 60)
-        print("\n📚 MAIN MENU")
-        print("─" * 60)  
-
-        print("1. Start Study Session")
-        print("2. Add New Task")
-        print("3. Update Task Status")
-        print("4. Edit Task Details")
-        print("5. Delete Task")
-        print("6. View Analytics Report")
-        print("7. Add New Course")
-        print("8. Smart Study Recommendation")
-        print("9. Save & Logout")
-        print("\nTip: Choose option 6 to see your productivity score!")
+
+        # build the whole menu as one string so it is written to the terminal in a single call
+        sys.stdout.write(
+            f"📊 Stats: {len(student.courses)} Courses | {len(student.tasks)} Tasks | {len(student.study_sessions)} Sessions\n"
+            + "-" * 60 + "\n"
+            + "\n📚 MAIN MENU\n"
+            + "─" * 60 + "\n"
+            + _MAIN_MENU_OPTIONS
+        )
 
         choice = input("\nSelect an option (1-9): ").strip()
         if choice == '1':
             # start/stop timer logic
             print("\n--- Start Study Session ---")
             print("Press Enter when you're ready to begin tracking your study time.")
-            input("Press Enter to START the study session...")
+            wait_for_enter("Press Enter to START the study session...")
 
             # start the logic
             session = controller.start_session(task = None) # default to no task
@@ -227,14 +313,14 @@ def main_menu(student):
             print(f"⏱️ Timer Started at {start_time_str}!")
             print("Focus on your work. Press Enter when you're done to stop the timer.")
 
-            input("Press Enter to STOP the study session...")
+            wait_for_enter("Press Enter to STOP the study session...")
 
             # stop the logic
             session = controller.stop_session()
 
             # save the results
             student.add_study_session(session)
-            db.save_data()
+            db.mark_dirty()
 
             print(f"\n✓ Study Session Saved!")
             print(f"You studied for {session.duration_minutes} minute(s).")
@@ -268,7 +354,7 @@ def main_menu(student):
                 break # date assigned is valid, move to next input
 
             # use what they typed, or default to "TBD" if blank
-            final_date_assigned = date_assigned_input if date_assigned_input else "TBD"
+            final_date_assigned = parse_date_input(date_assigned_input)
 
             # due date input loop
             while True:
@@ -284,7 +370,7 @@ def main_menu(student):
                 break # due date is valid, move to next input
 
             # use what they typed, or default to "TBD" if blank
-            final_due_date = due_date_input if due_date_input else "TBD"
+            final_due_date = parse_date_input(due_date_input)
 
             # weighted percentage input loop
             while True:
@@ -299,8 +385,8 @@ def main_menu(student):
                 task_percent = value
                 break # percentage is valid, proceed to create task
 
-            # simple ID generation
-            new_task_id = len(student.tasks) + 1
+            # the student hands out IDs from a counter, so a deleted task's ID is never reused
+            new_task_id = student.next_task_id
 
             # createt Task using the model
             new_task = Task(
@@ -315,7 +401,7 @@ def main_menu(student):
             )
 
             student.add_task(new_task)
-            db.save_data()
+            db.mark_dirty()
             print(f"\n✓ Task '{title}' added successfully!")
             pause()
 
@@ -328,42 +414,33 @@ def main_menu(student):
                 pause()
                 continue
 
+            # list all tasks
+            sys.stdout.write(render_task_table(student.tasks) + "\n")
+
+            t_id = input("\nEnter the Task ID to update: ").strip()
+
+            # find the task (a single dict lookup on the student's task index)
+            found_task = student.get_task(int(t_id)) if t_id.isdigit() else None
+
+            if found_task:
+                print(f"\nUpdating status for: '{found_task.title}'")
+                print("1. TODO")
+                print("2. IN PROGRESS")
+                print("3. DONE (Earn 50 productivity points!)")
+                new_status = input("Select new status (1-3): ").strip()
+
+                if new_status in ['1', '2', '3']:
+                    old_status = found_task.task_status
+                    student.set_task_status(found_task, int(new_status))
+                    db.mark_dirty()
+                    print(f"\n✓ Status updated from '{get_status_label(old_status)}' to '{get_status_label(int(new_status))}'")
+                    if new_status == '3':
+                        print("🎉 Congratulations on completing your task!")
+                else:
+                    print("\n✗ Invalid status selection. No changes made.")
             else:
-                # list all tasks
-                print(f"{'ID':<5} {'Status':<15} {'Title'}")
-                print("-" * 60)
-                for t in student.tasks:
-                    status_str = get_status_label(t.task_status)
-                    print(f"{t.task_id:<5} {status_str:<15} {t.title}")
-
-                    t_id = input("\nEnter the Task ID to update: ").strip()
-
-                    # find the task
-                    found_task = None
-                    for t in student.tasks:
-                        if str(t.task_id) == t_id:
-                            found_task = t
-                            break
-
-                    if found_task:
-                        print(f"\nUpdating status for: '{found_task.title}'")
-                        print("1. TODO")
-                        print("2. IN PROGRESS")
-                        print("3. DONE (Earn 50 productivity points!)")
-                        new_status = input("Select new status (1-3): ").strip()
-
-                        if new_status in ['1', '2', '3']:
-                            old_status = found_task.task_status
-                            found_task.task_status = int(new_status)
-                            db.save_data()
-                            print(f"\n✓ Status updated from '{get_status_label(old_status)}' to '{get_status_label(int(new_status))}'")
-                            if new_status == '3':
-                                print("🎉 Congratulations on completing your task!")
-                        else:
-                            print("\n✗ Invalid status selection. No changes made.")
-                    else:
-                        print(f"\n✗ Error: Task ID '{t_id}' not found.")
-                    pause()
+                print(f"\n✗ Error: Task ID '{t_id}' not found.")
+            pause()
 
         elif choice == '4':
             # edit task details logic
@@ -375,22 +452,15 @@ def main_menu(student):
                 continue
 
             # list all tasks
-            print(f"\n{'ID':<5} {'Title':<30} {'Due Date'}")
-            print("─" * 60)
-            for t in student.tasks:
-                print(f"{t.task_id:<5} {t.title:<30} {t.due_date}")
+            sys.stdout.write("\n" + render_task_table(student.tasks, cols="due") + "\n")
 
             t_id = input("\nEnter the Task ID to edit (or 0 to cancel): ").strip()
             
             if t_id == '0':
                 continue
 
-            # find the task
-            found_task = None
-            for t in student.tasks:
-                if str(t.task_id) == t_id:
-                    found_task = t
-                    break
+            # find the task (a single dict lookup on the student's task index)
+            found_task = student.get_task(int(t_id)) if t_id.isdigit() else None
 
             if not found_task:
                 print(f"\n✗ Error: Task ID '{t_id}' not found.")
@@ -401,17 +471,21 @@ def main_menu(student):
             print("─" * 40)
             print("Leave any field blank to keep the current value.\n")
 
+            changed = False # only save if at least one field was actually changed
+
             # Edit title
             new_title = input(f"New title (current: {found_task.title}): ").strip()
             if new_title:
                 found_task.title = new_title
+                changed = True
 
             # Edit due date
-            new_due_date = input(f"New due date (current: {found_task.due_date}): ").strip()
+            new_due_date = input(f"New due date (current: {format_date(found_task.due_date)}): ").strip()
             if new_due_date:
                 is_valid, error_msg = validate_date(new_due_date)
                 if is_valid:
-                    found_task.due_date = new_due_date
+                    found_task.due_date = parse_date_input(new_due_date)
+                    changed = True
                 else:
                     print(f"⚠️  Warning: {error_msg}. Keeping original due date.")
 
@@ -421,6 +495,7 @@ def main_menu(student):
                 is_valid, percent_value, error_msg = validate_percentage(new_percent)
                 if is_valid:
                     found_task.weighted_percent = percent_value
+                    changed = True
                 else:
                     print(f"⚠️  Warning: {error_msg}. Keeping original weight.")
 
@@ -430,11 +505,15 @@ def main_menu(student):
                 is_valid, points_value, error_msg = validate_percentage(new_points)
                 if is_valid:
                     found_task.points_earned = points_value
+                    changed = True
                 else:
                     print(f"⚠️  Warning: {error_msg}. Keeping original points.")
 
-            db.save_data()
-            print("\n✓ Task updated successfully!")
+            if changed:
+                db.mark_dirty()
+                print("\n✓ Task updated successfully!")
+            else:
+                print("\n✓ No changes made. Task was left as it was.")
             pause()
 
 
@@ -448,38 +527,28 @@ def main_menu(student):
                 continue
 
             # list all tasks
-            print(f"\n{'ID':<5} {'Status':<15} {'Title'}")
-            print("─" * 60)
-            for t in student.tasks:
-                status_str = get_status_label(t.task_status)
-                print(f"{t.task_id:<5} {status_str:<15} {t.title}")
+            sys.stdout.write("\n" + render_task_table(student.tasks) + "\n")
 
             t_id = input("\nEnter the Task ID to delete (or 0 to cancel): ").strip()
             
             if t_id == '0':
                 continue
 
-            # find the task
-            found_task = None
-            task_index = None
-            for i, t in enumerate(student.tasks):
-                if str(t.task_id) == t_id:
-                    found_task = t
-                    task_index = i
-                    break
+            # find the task (a single dict lookup on the student's task index)
+            found_task = student.get_task(int(t_id)) if t_id.isdigit() else None
 
             if found_task:
                 # Confirmation prompt for destructive action
                 print(f"\n⚠️  WARNING: You are about to delete:")
                 print(f"   Task: '{found_task.title}'")
                 print(f"   Status: {get_status_label(found_task.task_status)}")
-                print(f"   Due Date: {found_task.due_date}")
+                print(f"   Due Date: {format_date(found_task.due_date)}")
                 print(f"\n   This action CANNOT be undone!")
                 
                 if confirm_action("Are you sure you want to delete this task?"):
                     task_title = found_task.title
-                    student.tasks.pop(task_index)
-                    db.save_data()
+                    student.remove_task(found_task.task_id)
+                    db.mark_dirty()
                     print(f"\n✓ Task '{task_title}' has been deleted.")
                 else:
                     print("\n✓ Deletion cancelled. Task was not deleted.")
@@ -493,16 +562,18 @@ def main_menu(student):
             print("\n--- Productivity Analytics Report ---")
             print("═" * 60)
 
-            today_view = Day(date=str(datetime.now().date()), tasks=student.tasks, productivity_score=0.0)
-            score = AnalyticsEngine.calculate_daily_score(today_view)
+            total_study_minutes = student.total_study_minutes # kept up to date as sessions are added
 
-            total_study_minutes = sum(s.duration_minutes for s in student.study_sessions)
-            completed_tasks = sum(1 for t in student.tasks if t.task_status == 3)
-            in_progress_tasks = sum(1 for t in student.tasks if t.task_status == 2)
-            todo_tasks = sum(1 for t in student.tasks if t.task_status == 1)
+            # the student keeps running counts per status, so no loop over the tasks is needed for these
+            todo_tasks = student.tasks_by_status.get(Status.TODO, 0)
+            in_progress_tasks = student.tasks_by_status.get(Status.IN_PROGRESS, 0)
+            completed_tasks = student.tasks_by_status.get(Status.DONE, 0)
+            total_work_minutes = sum(t.total_work_time for t in student.tasks)
+            total_tasks = len(student.tasks)
+            score = AnalyticsEngine.score_from_totals(total_work_minutes, completed_tasks)
 
             print(f"\n📊 Overview:")
-            print(f"   Total Tasks: {len(student.tasks)}")
+            print(f"   Total Tasks: {total_tasks}")
             print(f"   - Completed: {completed_tasks}")
             print(f"   - In Progress: {in_progress_tasks}")
             print(f"   - To Do: {todo_tasks}")
@@ -538,14 +609,14 @@ def main_menu(student):
                 continue
             
             # Check for duplicate courses
-            if any(course.course_id == c_name for course in student.courses):
+            if student.get_course(c_name):
                 print(f"\n✗ Error: Course '{c_name}' already exists.")
                 pause()
                 continue
                 
             new_course = Course(course_id=c_name)
             student.add_course(new_course)
-            db.save_data()
+            db.mark_dirty()
             
             print(f"\n✓ Course '{c_name}' added successfully!")
             pause()
@@ -554,14 +625,14 @@ def main_menu(student):
             # smart recommendation logic
             print("\n--- 🧠 Smart Study Assistant ---")
             print("Finding your most critical task...") # Simple, user-friendly text
-            time.sleep(1) 
+            ux_delay(1) 
 
-            # Call the algorithm from controllers.py
-            recommended_task, reason = AnalyticsEngine.get_smart_recommendation(student)
+            # Call the algorithm from controllers.py (reading the clock once for the whole calculation)
+            recommended_task, reason = AnalyticsEngine.get_smart_recommendation(student, today=datetime.now())
 
             if recommended_task:
                 print(f"\n👉 RECOMMENDED TASK: {recommended_task.title}")
-                print(f"   Due: {recommended_task.due_date}")
+                print(f"   Due: {format_date(recommended_task.due_date)}")
                 print(f"   Status: {get_status_label(recommended_task.task_status)}")
                 print(f"   Why: {reason}")
                 
@@ -570,11 +641,11 @@ def main_menu(student):
                     # Auto-start the timer logic using the recommendation
                     session = controller.start_session(task=recommended_task)
                     print(f"\n⏱️ Timer Started for '{recommended_task.title}'!")
-                    input("Press Enter to STOP...")
+                    wait_for_enter("Press Enter to STOP...")
                     
                     session = controller.stop_session()
                     student.add_study_session(session)
-                    db.save_data()
+                    db.mark_dirty()
                     print(f"\n✓ Saved {session.duration_minutes} minutes of study.")
             else:
                 print(f"\n{reason}")
@@ -584,16 +655,16 @@ def main_menu(student):
         elif choice == '9':
             # save & logout logic
             print("\nSaving your data...")
-            db.save_data()
+            db.flush_if_dirty()
             print("✓ All changes saved successfully!")
             print(f"\nThank you for using SPAP, {student.email}!")
             print("See you next time! 👋")
-            time.sleep(2)
+            ux_delay(2)
             break
         
         else:
             print("\n✗ Invalid choice. Please enter a number between 1 and 8.")
-            time.sleep(1)
+            ux_delay(1)
 
 # program entry point
 if __name__ == "__main__":
@@ -602,10 +673,12 @@ if __name__ == "__main__":
         if current_user:
             main_menu(current_user)
     except KeyboardInterrupt:
+        db.flush_if_dirty() # don't lose changes that are still waiting to be written
         print("\n\n⚠️  Application interrupted by user.")
         print("Goodbye!")
         sys.exit()
     except Exception as e:
+        db.flush_if_dirty()
         print(f"\n\n✗ An unexpected error occurred: {e}")
         print("Please report this issue if it persists.")
         sys.exit(1)
\ No newline at end of file
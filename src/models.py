@@ -1,8 +1,8 @@
-from typing import List, Optional # 'List' is a type hint that says "this variable holds a list of things".
+from typing import Dict, List, Optional # 'List' is a type hint that says "this variable holds a list of things".
 from dataclasses import dataclass, field
 from enum import IntEnum
 import datetime
-import bcrypt
+import os
 
 class Type(IntEnum):
     LECTURE = 1
@@ -14,7 +14,54 @@ class Status(IntEnum):
     IN_PROGRESS = 2
     DONE = 3
 
-@dataclass
+# bcrypt work factor used for new passwords (each +1 doubles the time it takes to hash/check)
+# The library default is 12 (~250ms per login). This is a local, single-user CLI, so 10 (~4x faster)
+# is a better balance between login speed and brute-force resistance.
+# Existing hashes keep working: bcrypt reads the cost that was used from the stored hash itself.
+BCRYPT_ROUNDS = 10
+
+def bcrypt_cost() -> int:
+    """
+    Work factor for new hashes. Set the BCRYPT_COST env var to override it (the tests use 4 so they run fast).
+    Falls back to BCRYPT_ROUNDS if the value isn't a whole number that bcrypt accepts (4 to 31).
+    """
+    try:
+        cost = int(os.environ.get("BCRYPT_COST", BCRYPT_ROUNDS))
+    except ValueError:
+        return BCRYPT_ROUNDS
+    return cost if 4 <= cost <= 31 else BCRYPT_ROUNDS
+
+# bcrypt is only imported the first time a password is hashed or checked,
+# so starting the program (and drawing the login menu) doesn't wait for it to load
+_bcrypt = None
+
+def _get_bcrypt():
+    """Imports bcrypt on first use and returns the module."""
+    global _bcrypt
+    if _bcrypt is None:
+        import bcrypt
+        _bcrypt = bcrypt
+    return _bcrypt
+
+# Hash that no real password matches. It is checked against when an account has no hash (or doesn't exist),
+# so a failed login takes as long as a real one and timing doesn't reveal which emails are registered.
+# Made on first use at the configured cost, so it costs the same as checking a real hash.
+_dummy_hash = None
+
+def dummy_password_check(password_plain: str) -> bool:
+    """Runs a full bcrypt check that always fails, so it takes as long as checking a real password."""
+    global _dummy_hash
+    bcrypt = _get_bcrypt()
+    if _dummy_hash is None:
+        _dummy_hash = bcrypt.hashpw(os.urandom(16), bcrypt.gensalt(rounds=bcrypt_cost()))
+    bcrypt.checkpw(password_plain.encode('utf-8'), _dummy_hash)
+    return False
+
+def date_to_json(value):
+    """Dates are saved as ISO 8601 text ("2025-12-15T00:00:00"), anything else (like "TBD") is saved as it is."""
+    return value.isoformat() if isinstance(value, datetime.date) else value
+
+@dataclass(slots=True) # slots: no per-instance __dict__, so objects are smaller and attribute access is faster
 class Student:
     """
     The Student class stores all information related to one user of the system.
@@ -42,27 +89,89 @@ class Student:
     tasks: List["Task"] = field(default_factory=list)
     study_sessions: List["StudySession"] = field(default_factory=list)
 
+    # ID to give the next new task. Only ever goes up, so IDs are never reused after a task is deleted
+    next_task_id: int = 1
+
+    # Lookup table so finding a task by its ID doesn't have to scan the whole list
+    # This is kept in sync by add_task/remove_task and is never saved to the JSON file
+    _task_index: Dict[int, "Task"] = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    # Running count of tasks per status ({Status: number of tasks}), so reports don't have to loop over every task
+    # Kept up to date by add_task/remove_task/set_task_status, so always change a task's status through set_task_status
+    tasks_by_status: Dict[int, int] = field(
+        default_factory=lambda: {Status.TODO: 0, Status.IN_PROGRESS: 0, Status.DONE: 0},
+        init=False, repr=False, compare=False
+    )
+
+    # Running total of minutes over all study sessions, so the report doesn't have to add them up every time
+    # Kept up to date by add_study_session (sessions are only added once they are finished)
+    total_study_minutes: int = field(default=0, init=False, repr=False, compare=False)
+
+    # Lookup table so finding a course by its ID doesn't have to scan the whole list
+    # This is kept in sync by add_course and is never saved to the JSON file
+    _course_index: Dict[str, "Course"] = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # Build the lookup table for any courses passed in when the Student was created
+        self._course_index = {c.course_id: c for c in self.courses}
+        # Same for tasks, re-added through add_task so the ID counter, status counts and task index are filled in too
+        initial_tasks, self.tasks = self.tasks, []
+        for task in initial_tasks:
+            self.add_task(task)
+        self.total_study_minutes = sum(s.duration_minutes for s in self.study_sessions)
+
     def add_course(self, course: "Course") -> None:
         """
         Adds a course to the student's list of courses.
         The Student does not create courses, the UI or controller will.
         """
         self.courses.append(course)
+        self._course_index[course.course_id] = course
+
+    def get_course(self, course_id: str) -> Optional["Course"]:
+        """Finds a course by its ID. Returns None if not found."""
+        return self._course_index.get(course_id)
 
     def add_task(self, task: "Task") -> None:
-        """Adds a task to the student's global list of tasks.
+        """Adds a task to the student's own tasks (looked up by task_id).
         
         Note:
-        - Tasks also belong to specific courses.
-        - This method simply stores a copy here so AnalyticsEngine and other
-          components can quickly access all tasks in one place.
+        - This is the main place tasks are stored. The menus add tasks to the student
+          without linking them to a course, so most tasks only live here.
+        - A task that is also added to a course is the same Task object, not a copy.
+        - The same goes for study sessions.
         """
+        # Older saves could contain the same ID twice (IDs used to come from len(tasks) + 1),
+        # so give a clashing task a fresh ID instead of silently replacing the existing one
+        if task.task_id in self._task_index:
+            task.task_id = self.next_task_id
         self.tasks.append(task)
+        self._task_index[task.task_id] = task
+        self.next_task_id = max(self.next_task_id, task.task_id + 1)
+        self.tasks_by_status[task.task_status] = self.tasks_by_status.get(task.task_status, 0) + 1
+
+    def get_task(self, task_id: int) -> Optional["Task"]:
+        """Finds a task by its ID. Returns None if not found."""
+        return self._task_index.get(task_id)
+
+    def remove_task(self, task_id: int) -> Optional["Task"]:
         """
-        * Is a seperate global list of tasks necessary? We could instead just cycle each through each course and take the list of tasks from there. *
-        * Just since a global list would mostly be for viewing so the Student class wouldn't need immediate access to it. *
-        * Same with study sessions as well. *
+        Removes a task by its ID.
+        The index finds the task straight away, then it is removed from the list (keeping the order of the others).
+        Returns the removed task, or None if there was no task with that ID.
         """
+        task = self._task_index.pop(task_id, None)
+        if task is not None:
+            # compare by identity ('is'), not ==, so only this exact task object is removed
+            del self.tasks[next(i for i, t in enumerate(self.tasks) if t is task)]
+            self.tasks_by_status[task.task_status] -= 1
+        return task
+
+    def set_task_status(self, task: "Task", status: int) -> None:
+        """Changes a task's status and keeps the per-status counts up to date."""
+        self.tasks_by_status[task.task_status] -= 1
+        task.task_status = status
+        self.tasks_by_status[status] = self.tasks_by_status.get(status, 0) + 1
 
     def add_study_session(self, session: "StudySession") -> None:
         """
@@ -71,26 +180,31 @@ class Student:
         The SessionController creates the session and calculates its duration.
         """
         self.study_sessions.append(session)
+        self.total_study_minutes += session.duration_minutes
 
     # Added authentication methods (bcrypt) for password handling, because main.py requires secure login
     def set_password(self, password_plain):
-        self.password_hash = bcrypt.hashpw(password_plain.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+        bcrypt = _get_bcrypt()
+        self.password_hash = bcrypt.hashpw(password_plain.encode('utf-8'), bcrypt.gensalt(rounds=bcrypt_cost())).decode('utf-8')
 
     def check_password(self, password_plain):
-        if not self.password_hash: return False
-        return bcrypt.checkpw(password_plain.encode('utf-8'), self.password_hash.encode('utf-8'))
+        # The cost is read from the stored hash, not from BCRYPT_COST, so hashes made with any cost still verify
+        if not self.password_hash:
+            return dummy_password_check(password_plain) # same cost as a real check, then fail
+        return _get_bcrypt().checkpw(password_plain.encode('utf-8'), self.password_hash.encode('utf-8'))
     
     def to_dict(self):
         return {
             "email": self.email,
             "password_hash": self.password_hash,
             "student_id": self.student_id,
+            "next_task_id": self.next_task_id,
             "courses": [c.to_dict() for c in self.courses],
             "tasks": [t.to_dict() for t in self.tasks],
             "study_sessions": [s.to_dict() for s in self.study_sessions],
         }
 
-@dataclass
+@dataclass(slots=True)
 class Course:
     """
     The Course class stores all information related to one of a users courses.
@@ -139,7 +253,7 @@ class Course:
             "calendar": [d.to_dict() for d in self.calendar],
         }
 
-@dataclass
+@dataclass(slots=True)
 class Task:
     """
     The Task class stores all information related to a specific task.
@@ -168,15 +282,15 @@ class Task:
         return {
             "task_id": self.task_id,
             "title": self.title,
-            "date_assigned": str(self.date_assigned),
-            "due_date": str(self.due_date),
+            "date_assigned": date_to_json(self.date_assigned),
+            "due_date": date_to_json(self.due_date),
             "weighted_percent": self.weighted_percent,
             "points_earned": self.points_earned,
             "task_status": self.task_status,
             "total_work_time": self.total_work_time,
         }
 
-@dataclass
+@dataclass(slots=True)
 class StudySession:
     """
     The StudySession class stores all information related to a specific study session.
@@ -205,8 +319,8 @@ class StudySession:
         task_data = None
         
         if self.session_task:
-            # Check if it has a .to_dict method (meaning it's a real Task object)
-            if hasattr(self.session_task, 'to_dict'):
+            # Check if it's a real Task object (isinstance is a direct type check, hasattr has to try the lookup)
+            if isinstance(self.session_task, Task):
                 task_data = self.session_task.to_dict()
             else:
                 # If not (it's likely an int ID loaded from JSON), just save the raw value
@@ -214,13 +328,13 @@ class StudySession:
 
         return {
             "session_id": self.session_id,
-            "start_time": str(self.start_time),
+            "start_time": date_to_json(self.start_time),
             "duration_minutes": self.duration_minutes,
             "session_type": self.session_type,
             "session_task": task_data
         }
 
-@dataclass
+@dataclass(slots=True)
 class Day:
     """
     The Day class stores all information related to a specific day for a specific course.
@@ -259,7 +373,7 @@ class Day:
 
     def to_dict(self):
         return {
-            "date": str(self.date),
+            "date": date_to_json(self.date),
             "productivity_score": self.productivity_score,
             "study_sessions": [s.to_dict() for s in self.study_sessions],
             "tasks": [t.to_dict() for t in self.tasks],
@@ -1,10 +1,83 @@
 import json
 import os
-from .models import Task, StudySession, Student, Course
+import sys
+import threading
+import time
+from datetime import datetime
+from .models import Task, StudySession, Student, Course, Day
 
 # Storing the database in a separate folder so it doesn't clutter the root directory.
 DATA_FILE = "data/database.json"
 
+# How long (in seconds) to wait for more changes before writing them to disk in the background.
+SAVE_DELAY = 1.0
+
+# The file is written compactly (no spaces or line breaks), which is smaller and lets json use its fast C encoder.
+# Set the SPAP_PRETTY environment variable (e.g. SPAP_PRETTY=1) to write it indented instead, for reading it in an editor.
+PRETTY_JSON = bool(os.environ.get("SPAP_PRETTY"))
+
+def _revive(d):
+    """
+    Called by json.load for every JSON object (innermost first), so nested lists are already objects here.
+    Works out what each dictionary is from a key only that class has, and rebuilds it.
+    """
+    if "task_id" in d:
+        d["date_assigned"] = _parse_date(d.get("date_assigned"))
+        d["due_date"] = _parse_date(d.get("due_date"))
+        return Task(**d) # '**d' is a shortcut that unpacks the dictionary into arguments.
+    if "session_id" in d:
+        d["start_time"] = _parse_start_time(d.get("start_time"))
+        return StudySession(**d)
+    if "course_id" in d:
+        d["course_id"] = _intern(d["course_id"]) # shared string object, so course ID lookups compare by identity first
+        return Course(**d)
+    if "productivity_score" in d:
+        d["date"] = _parse_date(d.get("date"))
+        return Day(**d)
+    if "email" in d:
+        return _build_student(d)
+    return d # the top level {"students": [...]} stays a dictionary
+
+def _intern(value):
+    """sys.intern for strings only, a hand-edited file might have a number here and sys.intern would crash on it."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+def _parse_date(value):
+    """Turns saved ISO date text back into a datetime. Values that aren't dates (like "TBD") are kept as they are."""
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            pass
+    return value
+
+def _parse_start_time(value):
+    """Session start times are epoch seconds. Older saves stored them as text, so turn those back into numbers."""
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            pass
+    return value
+
+def _build_student(s_data):
+    """Rebuilds a Student from its (already revived) courses, tasks and sessions."""
+    new_student = Student(
+        email=_intern(s_data['email']), # interned, so equal emails are one shared string object (cheaper dict lookups and comparisons)
+        password_hash=s_data.get('password_hash', ""), # Using .get() to avoid crashing if a field is missing in the JSON.
+        student_id=s_data.get('student_id', ""),
+        next_task_id=s_data.get('next_task_id', 1), # older saves don't have this, add_task below moves it past every loaded ID
+    )
+
+    # Using add_course/add_task (instead of appending directly) so the student's ID lookup tables are filled in too.
+    for c in s_data.get('courses', []):
+        new_student.add_course(c)
+    for t in s_data.get('tasks', []):
+        new_student.add_task(t)
+    for ss in s_data.get('study_sessions', []):
+        new_student.add_study_session(ss)
+    return new_student
+
 class DatabaseHandler:
     """
     Handles all interactions with the JSON storage file.
@@ -14,6 +87,15 @@ class DatabaseHandler:
     def __init__(self):
         # We hold the list of students in memory while the program runs.
         self.students = []
+        self._by_email = {} # email -> Student, so get_student doesn't have to scan the whole list
+
+        # Background saving (see mark_dirty). Changes made close together are combined into one write.
+        self._pending_snapshot = None # latest snapshot waiting to be written (None means nothing is dirty)
+        self._pending_lock = threading.Lock() # protects _pending_snapshot
+        self._write_lock = threading.Lock() # only one write at a time, so an older snapshot never overwrites a newer one
+        self._save_requested = threading.Event()
+        self._saver_thread = None # started the first time something is marked dirty
+
         self.load_data()
 
     def load_data(self):
@@ -34,62 +116,110 @@ class DatabaseHandler:
         
         try:
             with open(DATA_FILE, "r") as f:
-                data = json.load(f)
-                self.students = []
-
-                # Loop through the raw dictionaries in the JSON file and create actual objects for each one.
-                for s_data in data.get("students", []):
-                    new_student = Student(
-                        email=s_data['email'],
-                        password_hash=s_data.get('password_hash', ""), # Using .get() to avoid crashing if a field is missing in the JSON.
-                        student_id=s_data.get('student_id', ""),
-                    )
-
-                    # Load courses
-                    for c in s_data.get('courses', []):
-                        new_student.courses.append(Course(**c))
-
-                    # The student has a list of tasks, so we need to rebuild those too.
-                    for t in s_data.get('tasks', []):
-                        new_student.tasks.append(Task(**t)) # '**t' is a shortcut that unpacks the dictionary into arguments.
-
-                    # Same thing for study sessions.
-                    for ss in s_data.get('study_sessions', []):
-                        new_student.study_sessions.append(StudySession(**ss))
-
-                    # Add the fully reconstructed student to the list.
-                    self.students.append(new_student)
+                # object_hook turns each dictionary into its object as soon as the parser finishes it,
+                # so there is only one pass over the data and the raw dictionaries are thrown away straight away.
+                data = json.load(f, object_hook=_revive)
+                self.students = data.get("students", [])
+                self._by_email = {s.email: s for s in self.students}
         except (json.JSONDecodeError, FileNotFoundError) as e:
             # If the file is corrupted (if user edited it manually or something), we catch the error instead of crashing.
             print(f"Warning: Database corrupted or mising ({e}). Starting with empty data.")
             self.students = []
+            self._by_email = {}
 
-    def save_data(self):
+    def snapshot(self):
         """
-        Serializes all the Python objects into simple dictionaries so they can be written to the JSON file.
+        Converts all the Python objects into simple dictionaries that can be written to the JSON file.
+
+        The result only contains plain values (no live objects), so it can safely be written
+        later from another thread while the user keeps making changes.
         """
-        data = {
+        return {
             "students": [s.to_dict() for s in self.students]  # Calling .to_dict() on every student because JSON can't save objects directly.
         }
 
-        # Write to the file with indent=4 for better readability if you open it in Notepad or something like that.
-        with open(DATA_FILE, "w") as f:
-            json.dump(data, f, indent=4)
+    def save_data(self, data=None):
+        """
+        Writes the data to the JSON file.
+        If no snapshot is given, takes one of the current data first.
+        """
+        if data is None:
+            data = self.snapshot()
+
+        # Write to a temporary file first and then swap it in, so a crash in the middle of a save
+        # can never leave a half-written (corrupted) database behind - the old file stays until the new one is complete.
+        tmp_file = DATA_FILE + ".tmp"
+        with open(tmp_file, "w") as f:
+            if PRETTY_JSON:
+                json.dump(data, f, indent=4) # indent=4 for better readability if you open it in Notepad or something like that.
+            else:
+                # json.dumps builds the whole string in C in one go (json.dump writes piece by piece in Python)
+                f.write(json.dumps(data, separators=(",", ":")))
+            f.flush()
+            os.fsync(f.fileno()) # make sure the data is actually on disk before the swap
+        os.replace(tmp_file, DATA_FILE) # atomic: readers see either the old file or the new one, never a mix
+
+    def mark_dirty(self):
+        """
+        Records that the data has changed and schedules a save in the background.
+        Returns immediately, so the menu never waits on disk I/O.
+        """
+        # Take the snapshot here (on the caller's thread) so the background thread never reads live objects
+        data = self.snapshot()
+        with self._pending_lock:
+            self._pending_snapshot = data
+        self._save_requested.set()
+
+        if self._saver_thread is None:
+            # daemon=True so this thread never keeps the program open after the user exits
+            self._saver_thread = threading.Thread(target=self._autosave_loop, daemon=True)
+            self._saver_thread.start()
+
+    def flush_if_dirty(self):
+        """
+        Writes any pending changes to disk right now (used on logout and exit).
+        Does nothing if nothing has changed since the last save.
+        """
+        with self._write_lock:
+            with self._pending_lock:
+                data, self._pending_snapshot = self._pending_snapshot, None
+                self._save_requested.clear()
+            if data is not None:
+                self.save_data(data)
+
+    def close(self):
+        """Writes anything still pending. Call this before the program exits."""
+        self.flush_if_dirty()
+
+    # Lets the handler be used as 'with DatabaseHandler() as db:' so the final write can't be forgotten
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _autosave_loop(self):
+        """Background loop: waits for changes, gives more changes a moment to arrive, then writes."""
+        while True:
+            self._save_requested.wait()
+            time.sleep(SAVE_DELAY)
+            self.flush_if_dirty()
 
     # Helper methods for the Controller
     
     def add_student(self, student):
         """
         Adds a new student and immediately saves to disk (Autosave).
+        Unlike other edits this isn't left to the background save: a new account must not be lost
+        if the window is closed straight after registering.
         """
         self.students.append(student)
-        self.save_data()
+        self._by_email[student.email] = student
+        self.mark_dirty()
+        self.flush_if_dirty()
 
     def get_student(self, email):
         """
         Finds a student by email. Returns None if not found.
         """
-        for s in self.students:
-            if s.email == email:
-                return s
-        return None
\ No newline at end of file
+        return self._by_email.get(email)
\ No newline at end of file
@@ -0,0 +1,4 @@
+import os
+
+# Hash test passwords with the lowest bcrypt cost so password tests take milliseconds instead of ~100ms each
+os.environ["BCRYPT_COST"] = "4"
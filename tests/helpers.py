@@ -0,0 +1,17 @@
+# Small builders shared by the test files (import from here, not from conftest.py, which pytest loads by itself)
+from src.models import Task, Status
+
+def make_task(task_id, **overrides):
+    """Builds a simple TODO task for tests. Pass any Task field as a keyword to change it (e.g. task_status = Status.DONE)"""
+    fields = dict(
+        task_id = task_id,
+        title = f"Task {task_id}",
+        date_assigned = "TBD",
+        due_date = "TBD",
+        weighted_percent = 10.0,
+        points_earned = 0.0,
+        task_status = Status.TODO,
+        total_work_time = 0.0
+    )
+    fields.update(overrides)
+    return Task(**fields)
@@ -1,12 +1,14 @@
 import pytest # to run the test do 'python -m pytest' in terminal
 import time
 from src.controllers import SessionController, AnalyticsEngine
-from src.models import Type, Day, Task, Status
-from datetime import datetime
+from src.models import Type, Day, Task, Status, Student, Course
+from datetime import datetime, timedelta
+from tests.helpers import make_task
 
 def test_session_timer():
     """Tests that the session timer correctly records time."""
-    controller = SessionController()
+    fake_now = [0] # fake monotonic clock in nanoseconds, so the test doesn't have to wait
+    controller = SessionController(clock = lambda: fake_now[0])
 
     # start a study session
     session = controller.start_session(session_type = Type.STUDY)
@@ -14,7 +16,7 @@ def test_session_timer():
     assert session.duration_minutes == 0
 
     # simulate 60 seconds passing
-    controller.start_timestamp -= 60
+    fake_now[0] += 60_000_000_000
 
     session = controller.stop_session()
 
@@ -46,4 +48,31 @@ def test_analytics_score():
     score = AnalyticsEngine.calculate_daily_score(day_view)
 
     # expected score: 10 (time) + 50 (bonus for DONE task) = 60.0
-    assert score == 60.0
\ No newline at end of file
+    assert score == 60.0
+
+def test_smart_recommendation_picks_most_urgent_task():
+    """Tests that the recommendation picks the highest weight / days-left task and skips DONE tasks."""
+    student = Student(email = "test@dal.ca", password_hash = "", student_id = 123456)
+
+    def due_in(days):
+        return (datetime.now() + timedelta(days = days)).strftime("%Y-%m-%d")
+
+    student.add_task(make_task(1, due_date = due_in(20), weighted_percent = 10.0)) # far away, low weight
+    student.add_task(make_task(2, due_date = due_in(3), weighted_percent = 30.0)) # the most urgent active task
+    student.add_task(make_task(3, due_date = due_in(1), weighted_percent = 50.0, task_status = Status.DONE)) # already done, must be ignored
+
+    task, reason = AnalyticsEngine.get_smart_recommendation(student)
+
+    assert task.task_id == 2
+    assert "Priority Score" in reason
+
+def test_course_grade():
+    """Tests the weighted course grade, ignoring tasks with no points yet."""
+    course = Course(course_id = "ECED 3410")
+    course.add_task(make_task(1, weighted_percent = 20.0, points_earned = 80.0, task_status = Status.DONE))
+    course.add_task(make_task(2, weighted_percent = 30.0, points_earned = 90.0, task_status = Status.DONE))
+    course.add_task(make_task(3, weighted_percent = 50.0, task_status = Status.DONE)) # not graded yet
+
+    # (0.8 * 20 + 0.9 * 30) / 100 * 100 = 43.0
+    assert AnalyticsEngine.calculate_course_grade(course) == 43.0
+    assert AnalyticsEngine.calculate_course_grade(Course(course_id = "EMPTY")) == 0.0
@@ -1,10 +1,13 @@
 import pytest # to run the test do 'python -m pytest' in terminal
-from src.models import Task, Student, Status
+from src import models
+from src.models import Task, Student, Status, Course
+from tests.helpers import make_task
 from datetime import datetime
 
 # Requirement #9 from prof: Automated Testing
 # Run this by typing 'pytest' in terminal
 
+
 def test_create_task():
     """checks if tasks initialize correctly with all fields"""
     task = Task(
@@ -22,6 +25,7 @@ def test_create_task():
     assert task.weighted_percent == 20.0
     assert task.task_status == Status.TODO # check against the enum not string
 
+
 def test_student_password_hashing():
     """Checks if bcrypt is actually hashing the password"""
     student = Student(
@@ -38,4 +42,129 @@ def test_student_password_hashing():
 
     # check that the password verifies correctly
     assert student.check_password("secure123") is True
-    assert student.check_password("wrongpassword") is False
\ No newline at end of file
+    assert student.check_password("wrongpassword") is False
+
+
+def test_bcrypt_cost_falls_back_on_bad_values(monkeypatch):
+    """checks that a broken BCRYPT_COST setting uses the default cost instead of crashing"""
+    for bad in ("fast", "", "2", "99"):
+        monkeypatch.setenv("BCRYPT_COST", bad)
+        assert models.bcrypt_cost() == models.BCRYPT_ROUNDS
+
+    monkeypatch.setenv("BCRYPT_COST", "5")
+    assert models.bcrypt_cost() == 5
+
+
+def test_student_task_and_course_lookup():
+    """checks that tasks and courses can be found by ID and that removing a task updates the lookup"""
+    student = Student(email = "test@dal.ca", student_id = 123456, password_hash = "")
+
+    for task_id in (1, 2, 3):
+        student.add_task(make_task(task_id))
+    student.add_course(Course(course_id = "ECED 3410"))
+
+    assert student.get_task(2).title == "Task 2"
+    assert student.get_task(99) is None
+    assert student.get_course("ECED 3410") is not None
+    assert student.get_course("MATH 2000") is None
+
+    removed = student.remove_task(2)
+    assert removed.title == "Task 2"
+    assert student.get_task(2) is None
+    assert [t.task_id for t in student.tasks] == [1, 3] # order of the remaining tasks is kept
+    assert student.remove_task(2) is None
+
+
+def test_student_tasks_argument_equality_and_repr():
+    """checks that tasks can still be passed to Student(...) and count for == and repr()"""
+    student = Student("test@dal.ca", "", 123456, [], [make_task(1), make_task(2)]) # tasks is still the 5th argument
+
+    assert [t.task_id for t in student.tasks] == [1, 2]
+    assert student.tasks[0].task_id == 1 # a plain list, like Course.tasks and Day.tasks
+    assert student.next_task_id == 3
+    assert student.tasks_by_status[Status.TODO] == 2
+    assert student.study_sessions == []
+
+    assert student == Student(email = "test@dal.ca", password_hash = "", student_id = 123456, tasks = [make_task(1), make_task(2)])
+    assert student != Student(email = "test@dal.ca", password_hash = "", student_id = 123456, tasks = [make_task(3)])
+    assert "tasks=[Task(task_id=1" in repr(student)
+
+
+def test_student_status_counts():
+    """checks that the per-status task counts follow adds, status changes and removals"""
+    student = Student(email = "test@dal.ca", student_id = 123456, password_hash = "")
+
+    for task_id, status in ((1, Status.TODO), (2, Status.TODO), (3, Status.DONE)):
+        student.add_task(make_task(task_id, task_status = status))
+
+    assert student.tasks_by_status == {Status.TODO: 2, Status.IN_PROGRESS: 0, Status.DONE: 1}
+
+    student.set_task_status(student.get_task(1), Status.IN_PROGRESS)
+    assert student.get_task(1).task_status == Status.IN_PROGRESS
+    assert student.tasks_by_status == {Status.TODO: 1, Status.IN_PROGRESS: 1, Status.DONE: 1}
+
+    student.remove_task(3)
+    assert student.tasks_by_status == {Status.TODO: 1, Status.IN_PROGRESS: 1, Status.DONE: 0}
+
+
+def test_student_task_ids_are_not_reused():
+    """checks that new task IDs keep counting up after a delete, and that clashing IDs get a fresh one"""
+    student = Student(email = "test@dal.ca", student_id = 123456, password_hash = "")
+
+    student.add_task(make_task(student.next_task_id))
+    student.add_task(make_task(student.next_task_id))
+    student.remove_task(1)
+    assert student.next_task_id == 3
+
+    # an old save with a repeated ID must not overwrite the existing task
+    duplicate = make_task(2)
+    student.add_task(duplicate)
+    assert duplicate.task_id == 3
+    assert len(student.tasks) == 2
+    assert student.next_task_id == 4
+
+
+class CountingBcrypt:
+    """Stands in for the bcrypt module, counts how many real (slow) checks are run"""
+    def __init__(self):
+        self.checks = 0
+
+    def hashpw(self, password, salt):
+        return b"$2b$04$" + password
+
+    def gensalt(self, rounds):
+        return b"salt"
+
+    def checkpw(self, password, hashed):
+        self.checks += 1
+        return hashed == b"$2b$04$" + password
+
+
+def test_failed_logins_always_run_a_full_check(monkeypatch):
+    """Checks that every failed login (wrong password, no hash, unknown email) runs a full bcrypt check, so all failures take the same time"""
+    fake = CountingBcrypt()
+    monkeypatch.setattr(models, "_get_bcrypt", lambda: fake)
+    monkeypatch.setattr(models, "_dummy_hash", None)
+
+    student = Student(email = "test@dal.ca", student_id = 123456, password_hash = "")
+    student.set_password("secure123")
+
+    # the same wrong password twice on a real account: both attempts run bcrypt
+    assert student.check_password("wrongpassword") is False
+    assert student.check_password("wrongpassword") is False
+    assert fake.checks == 2
+
+    # an account without a hash goes through the dummy check every time
+    student.password_hash = ""
+    assert student.check_password("wrongpassword") is False
+    assert student.check_password("wrongpassword") is False
+    assert fake.checks == 4
+
+    # an unknown email (login_menu calls the dummy check directly)
+    assert models.dummy_password_check("wrongpassword") is False
+    assert fake.checks == 5
+
+    # a correct password is checked with bcrypt too
+    student.set_password("secure123")
+    assert student.check_password("secure123") is True
+    assert fake.checks == 6
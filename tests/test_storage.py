@@ -0,0 +1,111 @@
+import pytest # to run the test do 'python -m pytest' in terminal
+import json
+import os
+from datetime import datetime
+from src import storage
+from src.storage import DatabaseHandler
+from src.models import Student, Course, Task, StudySession, Type
+from tests.helpers import make_task
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """Gives each test its own empty database file instead of the real data/database.json"""
+    monkeypatch.setattr(storage, "DATA_FILE", str(tmp_path / "database.json"))
+    return DatabaseHandler()
+
+def read_students():
+    with open(storage.DATA_FILE) as f:
+        return json.load(f)["students"]
+
+def test_flush_if_dirty_writes_pending_changes(db):
+    """Checks that marked changes are written by flush_if_dirty and that a clean flush does nothing"""
+    db.students.append(Student(email = "test@dal.ca", password_hash = "", student_id = 123456))
+    db.mark_dirty()
+    db.flush_if_dirty()
+
+    assert [s["email"] for s in read_students()] == ["test@dal.ca"]
+
+    # nothing changed since the last save, so the file must not be rewritten
+    db.students.clear()
+    db.flush_if_dirty()
+    assert len(read_students()) == 1
+
+def test_add_student_is_saved_straight_away(tmp_path, monkeypatch):
+    """Checks that a new account is on disk as soon as add_student returns, without waiting for the background save"""
+    monkeypatch.setattr(storage, "DATA_FILE", str(tmp_path / "database.json"))
+    monkeypatch.setattr(storage, "SAVE_DELAY", 60) # make sure the background thread can't be the one that saves
+
+    with DatabaseHandler() as db:
+        db.add_student(Student(email = "test@dal.ca", password_hash = "", student_id = 123456))
+        assert [s["email"] for s in read_students()] == ["test@dal.ca"]
+
+    assert [s["email"] for s in read_students()] == ["test@dal.ca"]
+
+def test_save_data_replaces_file_atomically(db):
+    """Checks that saving goes through a temp file that doesn't stay behind"""
+    db.students.append(Student(email = "test@dal.ca", password_hash = "", student_id = 123456))
+    db.save_data()
+
+    assert [s["email"] for s in read_students()] == ["test@dal.ca"]
+    assert not os.path.exists(storage.DATA_FILE + ".tmp")
+
+def test_get_student_after_add_and_reload(db):
+    """Checks that students can be found by email both right after adding them and after loading from disk"""
+    db.add_student(Student(email = "test@dal.ca", password_hash = "", student_id = 123456))
+    assert db.get_student("test@dal.ca").student_id == 123456
+    assert db.get_student("missing@dal.ca") is None
+
+    db.flush_if_dirty()
+    reloaded = DatabaseHandler()
+    assert reloaded.get_student("test@dal.ca").student_id == 123456
+
+def test_load_rebuilds_nested_objects(db):
+    """Checks that tasks inside courses and sessions come back as objects (not plain dictionaries) after a reload"""
+    task = make_task(1, title = "Lab 4")
+    student = Student(email = "test@dal.ca", password_hash = "", student_id = 123456)
+    student.add_task(task)
+    student.add_course(Course(course_id = "ECED 3410", tasks = [task]))
+    student.add_study_session(StudySession(session_id = 1, start_time = "1765450000.0", duration_minutes = 30,
+                                           session_type = Type.STUDY, session_task = task))
+    db.add_student(student)
+    db.flush_if_dirty()
+
+    loaded = DatabaseHandler().get_student("test@dal.ca")
+    assert loaded.get_task(1).title == "Lab 4"
+    assert isinstance(loaded.get_course("ECED 3410").tasks[0], Task)
+    assert isinstance(loaded.study_sessions[0].session_task, Task)
+    assert loaded.total_study_minutes == 30
+
+def test_dates_round_trip_as_datetimes(db):
+    """Checks that task dates come back as datetimes after a reload, and that "TBD" is kept as text"""
+    student = Student(email = "test@dal.ca", password_hash = "", student_id = 123456)
+    student.add_task(make_task(1, due_date = datetime(2025, 12, 31)))
+    db.add_student(student)
+    db.flush_if_dirty()
+
+    assert read_students()[0]["tasks"][0]["due_date"] == "2025-12-31T00:00:00"
+
+    task = DatabaseHandler().get_student("test@dal.ca").get_task(1)
+    assert task.due_date == datetime(2025, 12, 31)
+    assert task.date_assigned == "TBD"
+
+def test_save_is_compact_unless_pretty(db, monkeypatch):
+    """Checks that the file is written without whitespace by default and indented when SPAP_PRETTY is on"""
+    db.students.append(Student(email = "test@dal.ca", password_hash = "", student_id = 123456))
+    db.save_data()
+    with open(storage.DATA_FILE) as f:
+        assert "\n" not in f.read()
+
+    monkeypatch.setattr(storage, "PRETTY_JSON", True)
+    db.save_data()
+    with open(storage.DATA_FILE) as f:
+        assert '\n    "students"' in f.read()
+    assert [s["email"] for s in read_students()] == ["test@dal.ca"]
+
+def test_load_accepts_non_text_ids(db):
+    """Checks that a hand-edited file with a numeric email or course ID still loads"""
+    with open(storage.DATA_FILE, "w") as f:
+        json.dump({"students": [{"email": 12345, "courses": [{"course_id": 3410}]}]}, f)
+
+    student = DatabaseHandler().get_student(12345)
+    assert student.get_course(3410) is not None